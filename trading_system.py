@@ -9,22 +9,63 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import time
-import schedule
 from datetime import datetime, timezone, timedelta
-import json
+import orjson
 import logging
+import logging.handlers
 import matplotlib.pyplot as plt
 
+
+class BatchFileHandler(logging.FileHandler):
+    """FileHandler that does not flush its stream after every record"""
+
+    def flush(self):
+        """Leave buffered output in the stream; see flush_stream()"""
+
+    def flush_stream(self):
+        """Flush the stream once, writing all buffered records"""
+        logging.FileHandler.flush(self)
+
+
+class BatchMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that writes its buffered records with a single flush"""
+
+    def flush(self):
+        """Send the buffered records to the target, then flush its stream once"""
+        self.acquire()
+        try:
+            target = self.target
+            super().flush()
+            if target:
+                target.flush_stream()
+        finally:
+            self.release()
+
+
 # Setup logging
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# File records are buffered and written every 100 records, on errors and at exit
+log_file_handler = BatchFileHandler('trading.log')
+log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+log_buffer = BatchMemoryHandler(
+    capacity=100,
+    flushLevel=logging.ERROR,
+    target=log_file_handler
+)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('trading.log'),
+        log_buffer,
         logging.StreamHandler()
     ]
 )
 
+# Serialize numpy scalars natively and treat naive datetimes as UTC
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
 
 class LiveDataManager:
     """Manages real-time market data fetching"""
@@ -33,23 +74,25 @@ class LiveDataManager:
         self.tickers = tickers
         self.latest_prices = {}
 
-    def is_market_open(self):
+    def is_market_open(self, now=None):
         """
         Approximate US stock market hours (UTC, timezone-aware)
         Market hours: 9:30 AM - 4:00 PM EST = 14:30 - 21:00 UTC
+
+        now: current UTC time (defaults to datetime.now(timezone.utc))
         """
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         weekday = now.weekday()  # Monday = 0
 
         # Closed on weekends
         if weekday >= 5:
             return False
 
-        # US Market hours: 14:30–21:00 UTC
-        market_open = now.replace(hour=14, minute=30, second=0, microsecond=0)
-        market_close = now.replace(hour=21, minute=0, second=0, microsecond=0)
+        # US Market hours: 14:30–21:00 UTC, as minutes since midnight
+        minutes = now.hour * 60 + now.minute
 
-        return market_open <= now <= market_close
+        return 870 <= minutes <= 1260
 
     def get_live_prices(self):
         """
@@ -63,18 +106,18 @@ class LiveDataManager:
                 tickers=self.tickers,
                 period="1d",
                 interval="5m",
-                progress=False
+                progress=False,
+                group_by='ticker'
             )
 
-            prices = {}
-            for ticker in self.tickers:
-                try:
-                    if len(self.tickers) == 1:
-                        prices[ticker] = data["Close"].dropna().iloc[-1]
-                    else:
-                        prices[ticker] = data["Close"][ticker].dropna().iloc[-1]
-                except Exception as e:
-                    logging.warning(f"No price data for {ticker}: {e}")
+            # Columns are (ticker, field) for one or many tickers
+            close = data.xs("Close", axis=1, level=1)
+
+            # Last available price per ticker in a single pass
+            prices = close.ffill().iloc[-1].dropna().to_dict()
+
+            for ticker in set(self.tickers) - set(prices):
+                logging.warning(f"No price data for {ticker}")
 
             self.latest_prices = prices
             logging.info(f"✓ Fetched prices for {len(prices)} tickers")
@@ -106,14 +149,12 @@ class LiveDataManager:
                 tickers=self.tickers,
                 period=period,
                 interval=interval,
-                progress=False
+                progress=False,
+                group_by='ticker'
             )
 
-            if len(self.tickers) == 1:
-                prices = data["Close"].to_frame()
-                prices.columns = [self.tickers[0]]
-            else:
-                prices = data["Close"]
+            # Columns are (ticker, field) for one or many tickers
+            prices = data.xs("Close", axis=1, level=1)
 
             logging.info(f"✓ Retrieved {len(prices)} days of historical data")
             return prices
@@ -123,26 +164,149 @@ class LiveDataManager:
             return None
 
 
+def append_jsonl(filename, fields, columns):
+    """
+    Append rows to a JSON-lines file, one compact JSON object per line
+
+    fields: names of the columns
+    columns: equal-length sequences of values, one per field
+    """
+    if not len(columns[0]):
+        return
+
+    option = ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+
+    with open(filename, 'ab') as f:
+        f.write(b''.join(
+            orjson.dumps(dict(zip(fields, row)), option=option) for row in zip(*columns)
+        ))
+
+
+def read_jsonl(filename):
+    """Read all records from a JSON-lines file (empty list if missing)"""
+    try:
+        with open(filename, 'rb') as f:
+            return [orjson.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
 class PortfolioManager:
     """Manages current portfolio state"""
 
-    def __init__(self, initial_capital=100000):
+    # Fields of a trade record, in column order
+    trade_fields = ('timestamp', 'ticker', 'shares', 'price', 'cost', 'cash_after')
+
+    def __init__(self, initial_capital=100000, trades_file='trades.jsonl',
+                 equity_file='equity.jsonl'):
         self.initial_capital = initial_capital
         self.cash = initial_capital
-        self.positions = {}  # {ticker: shares}
-        self.trade_history = []
-        self.portfolio_value_history = []
+        self.positions = pd.Series(dtype=np.int64)  # {ticker: shares}
+
+        # Trade history as one list per column of trade_fields
+        self._th_ts = []
+        self._th_ticker = []
+        self._th_shares = []
+        self._th_price = []
+        self._th_cost = []
+        self._th_cash = []
+
+        # Portfolio value history as preallocated arrays, grown in chunks
+        self._pv_len = 0
+        self._pv_ts = np.empty(0, dtype='datetime64[ns]')
+        self._pv_value = np.empty(0, dtype=np.float64)
+        self._pv_return = np.empty(0, dtype=np.float64)
+
+        # Append-only logs, and how many records of each are already on disk
+        self.trades_file = trades_file
+        self.equity_file = equity_file
+        self._trades_saved = 0
+        self._equity_saved = 0
+
+        # The logs on disk belong to this portfolio only once it was loaded
+        # from them or has replaced them on its first save
+        self._logs_synced = False
+
+    def _trade_columns(self):
+        """Return the trade history columns, in trade_fields order"""
+        return (self._th_ts, self._th_ticker, self._th_shares,
+                self._th_price, self._th_cost, self._th_cash)
+
+    def _set_trade_history(self, records):
+        """Replace the trade history with saved records"""
+        for field, column in zip(self.trade_fields, self._trade_columns()):
+            column[:] = [record[field] for record in records]
+
+    @property
+    def trade_history(self):
+        """
+        Read-only snapshot of the trade history as {field: value} records
+
+        The list is rebuilt from the history columns on every access, so
+        changes to it are not kept; trades are recorded by execute_trade.
+        """
+        return [dict(zip(self.trade_fields, row)) for row in zip(*self._trade_columns())]
+
+    def get_trade_count(self):
+        """Return the number of trades executed"""
+        return len(self._th_ts)
+
+    def _reserve_value_history(self, size):
+        """Grow the value history arrays to hold at least size points"""
+        capacity = -(-size // 1024) * 1024
+        if capacity > self._pv_value.size:
+            self._pv_ts = np.resize(self._pv_ts, capacity)
+            self._pv_value = np.resize(self._pv_value, capacity)
+            self._pv_return = np.resize(self._pv_return, capacity)
+
+    def record_portfolio_value(self, timestamp, value):
+        """Append a point to the portfolio value history"""
+        n = self._pv_len
+        self._reserve_value_history(n + 1)
+
+        self._pv_ts[n] = np.datetime64(timestamp.astimezone(timezone.utc).replace(tzinfo=None), 'ns')
+        self._pv_value[n] = value
+        self._pv_return[n] = (value / self.initial_capital - 1) * 100
+        self._pv_len = n + 1
+
+    def get_value_history(self):
+        """
+        Return the portfolio value history
+
+        Returns:
+            Tuple of arrays (timestamps in UTC, values, returns in %)
+        """
+        n = self._pv_len
+        return self._pv_ts[:n], self._pv_value[:n], self._pv_return[:n]
+
+    def _set_value_history(self, records):
+        """Replace the portfolio value history with saved records"""
+        n = len(records)
+        timestamps = pd.to_datetime([r['timestamp'] for r in records], utc=True, format='ISO8601')
+
+        self._pv_len = 0
+        self._pv_ts = np.empty(0, dtype='datetime64[ns]')
+        self._pv_value = np.empty(0, dtype=np.float64)
+        self._pv_return = np.empty(0, dtype=np.float64)
+        self._reserve_value_history(n)
+
+        self._pv_ts[:n] = timestamps.tz_localize(None).to_numpy()
+        self._pv_value[:n] = [r['value'] for r in records]
+        self._pv_return[:n] = [r['return'] for r in records]
+        self._pv_len = n
 
     def get_current_positions(self):
-        """Return current positions"""
-        return self.positions.copy()
+        """Return current positions as {ticker: shares}"""
+        return self.positions.to_dict()
 
     def get_portfolio_value(self, current_prices):
         """Calculate total portfolio value"""
-        position_value = sum(
-            shares * current_prices.get(ticker, 0)
-            for ticker, shares in self.positions.items()
+        px = np.fromiter(
+            (current_prices.get(ticker, 0.0) for ticker in self.positions.index),
+            dtype=np.float64,
+            count=len(self.positions)
         )
+        position_value = float(self.positions.to_numpy(dtype=np.float64) @ px)
         total_value = self.cash + position_value
         return total_value
 
@@ -152,166 +316,342 @@ class PortfolioManager:
 
         shares > 0: Buy
         shares < 0: Sell
+
+        Raises ValueError for fractional share counts, before any state changes
         """
+        if shares != int(shares):
+            raise ValueError(f"Share count must be a whole number, got {shares}")
+        shares = int(shares)
+
         cost = shares * price
 
         # Update cash
         self.cash -= cost
 
         # Update positions
-        if ticker in self.positions:
-            self.positions[ticker] += shares
-        else:
-            self.positions[ticker] = shares
+        self.positions.at[ticker] = self.positions.get(ticker, 0) + shares
 
         # Remove zero positions
-        if self.positions.get(ticker, 0) == 0:
-            del self.positions[ticker]
+        if self.positions[ticker] == 0:
+            self.positions = self.positions.drop(ticker)
 
         # Record trade
-        trade = {
-            'timestamp': str(timestamp),
-            'ticker': ticker,
-            'shares': shares,
-            'price': price,
-            'cost': cost,
-            'cash_after': self.cash
-        }
-        self.trade_history.append(trade)
-
-        logging.info(f"{'BUY' if shares > 0 else 'SELL'} {abs(shares)} shares of {ticker} @ ${price:.2f}")
-
-    def rebalance_portfolio(self, target_positions, current_prices):
+        self._th_ts.append(timestamp.isoformat())
+        self._th_ticker.append(ticker)
+        self._th_shares.append(shares)
+        self._th_price.append(price)
+        self._th_cost.append(cost)
+        self._th_cash.append(self.cash)
+
+        # Skip formatting entirely when INFO logging is disabled
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(f"{'BUY' if shares > 0 else 'SELL'} {abs(shares)} shares of {ticker} @ ${price:.2f}")
+
+    def rebalance_portfolio(self, target_positions, current_prices, timestamp=None):
         """
         Rebalance portfolio to match target positions
 
         target_positions: {ticker: target_weight (-1 to 1)}
         current_prices: {ticker: current_price}
+        timestamp: time recorded for the trades (defaults to now, UTC)
+
+        Returns:
+            True if every position could be traded to its target, False if
+            some tickers were left untraded for lack of a price
         """
-        timestamp = datetime.now(timezone.utc)
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
         total_value = self.get_portfolio_value(current_prices)
 
         trades_executed = 0
 
-        # Calculate target shares for each position
-        target_shares = {}
-        for ticker, weight in target_positions.items():
-            if ticker not in current_prices or current_prices[ticker] == 0:
-                continue
+        weights = pd.Series(target_positions, dtype=np.float64)
+        prices = pd.Series(current_prices, dtype=np.float64)
+        valid_prices = prices[prices != 0]
 
-            target_value = total_value * weight
-            target_shares[ticker] = int(target_value / current_prices[ticker])
+        # Calculate target shares for each position (tickers without a price get none)
+        target_shares = (total_value * weights / valid_prices).dropna().astype(np.int64)
 
         # Calculate trades needed
-        all_tickers = set(self.positions.keys()) | set(target_shares.keys())
-
-        for ticker in all_tickers:
-            current_shares = self.positions.get(ticker, 0)
-            target_share = target_shares.get(ticker, 0)
-
-            shares_to_trade = target_share - current_shares
-
-            if shares_to_trade != 0 and ticker in current_prices:
-                self.execute_trade(
-                    ticker=ticker,
-                    shares=shares_to_trade,
-                    price=current_prices[ticker],
-                    timestamp=timestamp
-                )
-                trades_executed += 1
+        deltas = target_shares.sub(self.positions, fill_value=0).astype(np.int64)
+        deltas = deltas[deltas != 0]
+        tradable = deltas.index.isin(prices.index)
+
+        # Targets that cannot be reached now: weighted tickers without a
+        # usable price, and held tickers without any price
+        unpriced = weights[weights != 0].index.difference(valid_prices.index)
+        complete = unpriced.empty and tradable.all()
+
+        deltas = deltas[tradable]
+
+        for ticker, shares_to_trade in deltas.items():
+            self.execute_trade(
+                ticker=ticker,
+                shares=int(shares_to_trade),
+                price=current_prices[ticker],
+                timestamp=timestamp
+            )
+            trades_executed += 1
 
         logging.info(f"✓ Rebalancing complete: {trades_executed} trades executed")
 
         # Record portfolio value
         new_value = self.get_portfolio_value(current_prices)
-        self.portfolio_value_history.append({
-            'timestamp': str(timestamp),
-            'value': new_value,
-            'return': (new_value / self.initial_capital - 1) * 100
-        })
+        self.record_portfolio_value(timestamp, new_value)
+
+        return complete
 
     def save_state(self, filename='portfolio_state.json'):
-        """Save portfolio state to file"""
+        """
+        Save portfolio state to file
+
+        Cash and positions are rewritten; trades and portfolio values
+        recorded since the last save are appended to their JSON-lines logs.
+        Logs left by a session that was not loaded are replaced on the first save.
+        """
         state = {
             'cash': self.cash,
-            'positions': self.positions,
-            'trade_history': self.trade_history,
-            'portfolio_value_history': self.portfolio_value_history
+            'positions': self.positions.to_dict()
         }
 
-        with open(filename, 'w') as f:
-            json.dump(state, f, indent=2, default=str)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(state, option=ORJSON_OPTIONS))
+
+        if not self._logs_synced:
+            for log_file in (self.trades_file, self.equity_file):
+                open(log_file, 'wb').close()
+            self._logs_synced = True
+
+        saved = self._trades_saved
+        append_jsonl(
+            self.trades_file,
+            self.trade_fields,
+            [column[saved:] for column in self._trade_columns()]
+        )
+        self._trades_saved = self.get_trade_count()
+
+        saved = self._equity_saved
+        append_jsonl(
+            self.equity_file,
+            ('timestamp', 'value', 'return'),
+            [column[saved:] for column in self.get_value_history()]
+        )
+        self._equity_saved = self._pv_len
 
         logging.info(f"✓ Portfolio state saved to {filename}")
 
     def load_state(self, filename='portfolio_state.json'):
         """Load portfolio state from file"""
         try:
-            with open(filename, 'r') as f:
-                state = json.load(f)
+            with open(filename, 'rb') as f:
+                state = orjson.loads(f.read())
 
             self.cash = state['cash']
-            self.positions = state['positions']
-            self.trade_history = state['trade_history']
-            self.portfolio_value_history = state['portfolio_value_history']
+            self.positions = pd.Series(state['positions'], dtype=np.int64)
+            self._set_trade_history(read_jsonl(self.trades_file))
+            self._set_value_history(read_jsonl(self.equity_file))
+            self._trades_saved = self.get_trade_count()
+            self._equity_saved = self._pv_len
+            self._logs_synced = True
+
+            # Older state files kept the full history inline; it is moved
+            # to the logs on the next save
+            if 'trade_history' in state:
+                self._set_trade_history(state['trade_history'])
+                self._set_value_history(state['portfolio_value_history'])
+                self._trades_saved = 0
+                self._equity_saved = 0
+                self._logs_synced = False
 
             logging.info(f"✓ Portfolio state loaded from {filename}")
         except FileNotFoundError:
             logging.warning(f"No saved state found at {filename}")
 
 
+def calculate_momentum(prices, lookback):
+    """
+    Calculate the latest momentum (lookback-period return) for each ticker
+
+    Only the last row is computed, directly on the underlying array,
+    instead of shifting and dividing the whole price history. Just the
+    two rows needed are converted to float32, which is ample precision
+    for ranking returns.
+
+    Returns:
+        Series of {ticker: momentum}
+    """
+    values = prices.to_numpy()
+
+    if len(values) <= lookback:
+        return pd.Series(np.nan, index=prices.columns)
+
+    latest = values[-1].astype(np.float32)
+    past = values[-1 - lookback].astype(np.float32)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        momentum = latest / past - 1
+
+    return pd.Series(momentum, index=prices.columns)
+
+
 class LiveStrategyEngine:
     """Real-time strategy execution engine"""
 
-    def __init__(self, tickers, initial_capital=100000, rebalance_frequency='monthly'):
+    # Momentum horizons in trading days (1M, 3M, 6M, 12M)
+    factor_horizons = (21, 63, 126, 252)
+
+    # Full history download and number of daily bars kept in the cache
+    history_period = '2y'
+    history_days = max(factor_horizons) + 1
+
+    def __init__(self, tickers, initial_capital=100000, rebalance_frequency='monthly',
+                 cache_file='price_cache.parquet'):
         self.tickers = tickers
         self.data_manager = LiveDataManager(tickers)
         self.portfolio = PortfolioManager(initial_capital)
         self.rebalance_frequency = rebalance_frequency
         self.last_rebalance = None
 
-    def calculate_signals(self):
+        # Last signal set fully traded on, to skip unchanged rebalances
+        self._last_signals = None
+
+        # Historical price cache, reused across trading cycles and restarts
+        self.cache_file = cache_file
+        self._hist_cache = None
+        self._hist_cache_date = None
+        self.load_price_cache()
+
+    def load_price_cache(self):
+        """Load cached historical prices from disk"""
+        try:
+            cache = pd.read_parquet(self.cache_file, memory_map=True)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning(f"Could not load price cache from {self.cache_file}: {e}")
+            return
+
+        if cache.empty:
+            return
+
+        self._hist_cache = cache
+        self._hist_cache_date = cache.index[-1].date()
+        logging.info(f"✓ Loaded {len(cache)} days of cached prices from {self.cache_file}")
+
+    def save_price_cache(self):
+        """Save cached historical prices to disk"""
+        try:
+            self._hist_cache.to_parquet(self.cache_file, compression='zstd')
+        except Exception as e:
+            logging.warning(f"Could not save price cache to {self.cache_file}: {e}")
+
+    def get_price_history(self, now=None):
+        """
+        Return historical prices for factor calculation
+
+        Only the last few days are downloaded when the cache is recent;
+        otherwise the full history is fetched and the cache is rebuilt.
+        The cache is also rebuilt when the downloaded days disagree with
+        the cached ones, since a split or dividend re-adjusts all past prices.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        today = now.date()
+        cache = self._hist_cache
+        prices = None
+
+        if (cache is not None
+                and set(self.tickers).issubset(cache.columns)
+                and len(cache) >= self.history_days
+                and np.busday_count(self._hist_cache_date, today) < 5):
+            recent = self.data_manager.get_historical_data(period='5d')
+
+            if recent is None or recent.empty:
+                return cache
+
+            if self.cache_matches(cache, recent):
+                prices = pd.concat([cache, recent])
+                prices = prices[~prices.index.duplicated(keep='last')].sort_index()
+            else:
+                logging.info("Cached prices differ from latest data, refetching full history")
+
+        if prices is None:
+            prices = self.data_manager.get_historical_data(period=self.history_period)
+
+            if prices is None or prices.empty:
+                return prices
+
+        prices = prices.iloc[-self.history_days:]
+
+        self._hist_cache = prices
+        self._hist_cache_date = prices.index[-1].date()
+        self.save_price_cache()
+
+        return prices
+
+    def cache_matches(self, cache, recent):
+        """
+        Check that recently downloaded prices agree with the cached ones
+
+        The last cached day is skipped, as it may hold an intraday price.
+        Returns False when there is no other overlapping day to compare.
+        """
+        overlap = cache.index[:-1].intersection(recent.index)
+
+        if overlap.empty:
+            return False
+
+        cached = cache.loc[overlap, self.tickers].to_numpy(dtype=np.float64)
+        fresh = recent.reindex(index=overlap, columns=self.tickers).to_numpy(dtype=np.float64)
+
+        return np.allclose(cached, fresh, rtol=1e-6, equal_nan=True)
+
+    def calculate_signals(self, now=None):
         """Calculate trading signals based on current data"""
         logging.info("Calculating signals...")
 
         # Get historical data for factor calculation
-        prices = self.data_manager.get_historical_data(period='1y')
+        prices = self.get_price_history(now)
 
         if prices is None or prices.empty:
             logging.error("No historical data available")
             return {}
 
-        # Calculate momentum (simple 3-month for demo)
-        momentum_3m = prices / prices.shift(63) - 1
-        momentum_score = momentum_3m.iloc[-1]
+        # Calculate momentum as the average over all horizons
+        momentum = pd.concat(
+            {h: calculate_momentum(prices, lookback=h) for h in self.factor_horizons},
+            axis=1
+        )
+        momentum_score = momentum.mean(axis=1)
 
-        # Rank stocks
-        ranked = momentum_score.rank(pct=True)
+        momentum_score = momentum_score[momentum_score.index.isin(self.tickers)]
 
-        # Generate signals
-        signals = {}
-        for ticker in self.tickers:
-            if ticker not in ranked:
-                continue
+        # Select top/bottom 20% without sorting the whole universe
+        scores = momentum_score.dropna()
+        ranked_tickers = scores.index.to_numpy()
+        values = scores.to_numpy()
+        k = max(1, values.size // 5)
 
-            rank = ranked[ticker]
+        # Generate signals
+        signals = {ticker: 0 for ticker in momentum_score.index}  # No position
 
-            if rank >= 0.8:  # Top 20%
-                signals[ticker] = 0.05  # 5% position
-            elif rank <= 0.2:  # Bottom 20%
-                signals[ticker] = -0.05  # -5% short position
-            else:
-                signals[ticker] = 0  # No position
+        if values.size:
+            for ticker in ranked_tickers[np.argpartition(values, k - 1)[:k]]:
+                signals[ticker] = -0.05  # Bottom 20%: -5% short position
+            for ticker in ranked_tickers[np.argpartition(-values, k - 1)[:k]]:
+                signals[ticker] = 0.05  # Top 20%: 5% position
 
         logging.info(f"✓ Signals calculated: {len([s for s in signals.values() if s != 0])} active positions")
         return signals
 
-    def should_rebalance(self):
+    def should_rebalance(self, now=None):
         """Check if it's time to rebalance"""
         if self.last_rebalance is None:
             return True
 
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
 
         if self.rebalance_frequency == 'daily':
             return True
@@ -330,8 +670,11 @@ class LiveStrategyEngine:
         logging.info("RUNNING TRADING CYCLE")
         logging.info("="*60)
 
+        # Single timestamp for everything done in this cycle
+        now = datetime.now(timezone.utc)
+
         # Check if market is open
-        if not self.data_manager.is_market_open():
+        if not self.data_manager.is_market_open(now):
             logging.info("Market is closed. Skipping cycle.")
             return
 
@@ -348,16 +691,25 @@ class LiveStrategyEngine:
         logging.info(f"Portfolio Value: ${portfolio_value:,.2f} (PnL: {pnl:+.2f}%)")
 
         # Check if we should rebalance
-        if self.should_rebalance():
+        if self.should_rebalance(now):
             logging.info("Rebalancing portfolio...")
 
             # Calculate new signals
-            signals = self.calculate_signals()
+            signals = self.calculate_signals(now)
 
             if signals:
-                # Execute rebalancing
-                self.portfolio.rebalance_portfolio(signals, current_prices)
-                self.last_rebalance = datetime.now(timezone.utc)
+                sorted_signals = tuple(sorted(signals.items()))
+
+                if sorted_signals == self._last_signals:
+                    logging.info("Signals unchanged, skipping trades")
+                else:
+                    # Execute rebalancing
+                    complete = self.portfolio.rebalance_portfolio(signals, current_prices, now)
+
+                    # Only skip next time if every target was reached
+                    self._last_signals = sorted_signals if complete else None
+
+                self.last_rebalance = now
             else:
                 logging.warning("No signals generated, skipping rebalancing")
         else:
@@ -383,17 +735,17 @@ class LiveStrategyEngine:
         logging.info(f"Check Interval: {check_interval_minutes} minutes")
         logging.info("="*60)
 
-        # Schedule trading cycle
-        schedule.every(check_interval_minutes).minutes.do(self.run_trading_cycle)
+        interval = check_interval_minutes * 60
+        next_run = time.monotonic()
 
-        # Run first cycle immediately
-        self.run_trading_cycle()
-
-        # Main loop
+        # Main loop: run a cycle, then sleep until the next deadline
+        # (deadlines missed by a slow cycle are skipped, not caught up)
         try:
             while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                self.run_trading_cycle()
+                log_buffer.flush()
+                next_run = max(next_run + interval, time.monotonic())
+                time.sleep(max(0, next_run - time.monotonic()))
         except KeyboardInterrupt:
             logging.info("\n" + "="*60)
             logging.info("SHUTTING DOWN LIVE TRADING SYSTEM")
@@ -408,20 +760,19 @@ class LiveStrategyEngine:
 
                 logging.info(f"Final Portfolio Value: ${final_value:,.2f}")
                 logging.info(f"Total PnL: {final_pnl:+.2f}%")
-                logging.info(f"Total Trades: {len(self.portfolio.trade_history)}")
+                logging.info(f"Total Trades: {self.portfolio.get_trade_count()}")
 
 
 def plot_equity_curve(portfolio_manager):
     """Plot the equity curve showing portfolio value over time"""
-    if not portfolio_manager.portfolio_value_history:
+    timestamps, values, _ = portfolio_manager.get_value_history()
+
+    if not values.size:
         print("No portfolio history to plot")
         return
 
-    df = pd.DataFrame(portfolio_manager.portfolio_value_history)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-
     plt.figure(figsize=(12, 6))
-    plt.plot(df['timestamp'], df['value'])
+    plt.plot(timestamps, values)
     plt.title("Equity Curve (Portfolio Value Over Time)")
     plt.xlabel("Time")
     plt.ylabel("Portfolio Value ($)")
@@ -432,25 +783,25 @@ def plot_equity_curve(portfolio_manager):
 
 def calculate_performance_metrics(portfolio_manager):
     """Calculate and display performance metrics"""
-    if not portfolio_manager.portfolio_value_history:
+    _, values, returns = portfolio_manager.get_value_history()
+
+    if not values.size:
         print("No portfolio history available")
         return
 
-    df = pd.DataFrame(portfolio_manager.portfolio_value_history)
-
-    total_return = df['return'].iloc[-1]
-    max_value = df['value'].max()
-    min_value = df['value'].min()
+    total_return = returns[-1]
+    max_value = np.max(values)
+    min_value = np.min(values)
 
     print("="*60)
     print("PERFORMANCE METRICS")
     print("="*60)
     print(f"Initial Capital: ${portfolio_manager.initial_capital:,.2f}")
-    print(f"Current Value: ${df['value'].iloc[-1]:,.2f}")
+    print(f"Current Value: ${values[-1]:,.2f}")
     print(f"Total Return: {total_return:.2f}%")
     print(f"Max Value: ${max_value:,.2f}")
     print(f"Min Value: ${min_value:,.2f}")
-    print(f"Total Trades: {len(portfolio_manager.trade_history)}")
+    print(f"Total Trades: {portfolio_manager.get_trade_count()}")
     print("="*60)
 
 